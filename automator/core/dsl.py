@@ -3,11 +3,25 @@ DSL (Domain Specific Language) for automation recipes.
 Defines Pydantic models for recipe structure, validation, and execution.
 """
 
-import re
+from collections import Counter
+from functools import lru_cache
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
+
+
+class _VariableTemplate(Template):
+    """Template matching only ${variable} references; bare $ text is left as is."""
+    pattern = r'''
+    \$(?:
+      (?P<escaped>(?!))       |  # No $$ escape: typed text keeps every $
+      (?P<named>(?!))         |  # No bare $name references
+      \{(?P<braced>[^}]+)\}   |  # ${variable}
+      (?P<invalid>(?!))
+    )
+    '''
 
 
 class SelectorType(str, Enum):
@@ -37,13 +51,28 @@ class ActionType(str, Enum):
     OCR_TEXT = "ocr_text"
 
 
+# Selector field -> entropy weight; higher weights are more specific
+SELECTOR_ENTROPY_WEIGHTS = (
+    ('automation_id', 10),  # AutomationId is most specific
+    ('control_type', 5),    # ControlType + other attributes are moderately specific
+    ('class_name', 3),
+    ('name', 2),
+    ('value', 2),
+    ('help_text', 1),
+    ('accessible_name', 1),
+)
+
+
 class WindowSelector(BaseModel):
     """Selector for targeting application windows."""
+    model_config = ConfigDict(frozen=True)
+    
     name: Optional[str] = Field(None, description="Window title or partial title")
     class_name: Optional[str] = Field(None, description="Window class name")
     process_id: Optional[int] = Field(None, description="Process ID")
     
-    @validator('name')
+    @field_validator('name')
+    @classmethod
     def validate_name(cls, v):
         if v and len(v) < 2:
             raise ValueError("Window name must be at least 2 characters long")
@@ -52,6 +81,8 @@ class WindowSelector(BaseModel):
 
 class ElementSelector(BaseModel):
     """Selector for targeting UI elements within windows."""
+    model_config = ConfigDict(frozen=True)
+    
     automation_id: Optional[str] = Field(None, description="UIA AutomationId property")
     control_type: Optional[str] = Field(None, description="UIA ControlType")
     class_name: Optional[str] = Field(None, description="Element class name")
@@ -60,34 +91,30 @@ class ElementSelector(BaseModel):
     help_text: Optional[str] = Field(None, description="Element help text")
     accessible_name: Optional[str] = Field(None, description="Accessible name")
     index: Optional[int] = Field(0, description="Element index when multiple matches")
+    max_depth: Optional[int] = Field(3, ge=1, description="Levels walked below the window before searching the full subtree (None for direct children only)")
+    
+    _entropy_score: int = PrivateAttr(0)
+    
+    def model_post_init(self, __context: Any) -> None:
+        """Precompute the selector entropy score once the fields are set."""
+        self._entropy_score = sum(
+            weight for field, weight in SELECTOR_ENTROPY_WEIGHTS if getattr(self, field)
+        )
+    
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> 'ElementSelector':
+        """Copy the selector, rescoring it since update may change selector fields."""
+        copied = super().model_copy(update=update, deep=deep)
+        copied.model_post_init(None)
+        return copied
     
     def get_selector_entropy_score(self) -> int:
         """Calculate selector entropy score - higher is more specific."""
-        score = 0
-        # AutomationId is most specific
-        if self.automation_id:
-            score += 10
-        # ControlType + other attributes are moderately specific
-        if self.control_type:
-            score += 5
-        if self.class_name:
-            score += 3
-        if self.name:
-            score += 2
-        if self.value:
-            score += 2
-        if self.help_text:
-            score += 1
-        if self.accessible_name:
-            score += 1
-        return score
+        return self._entropy_score
     
     def has_selectors(self) -> bool:
         """Check if any selectors are defined."""
-        return any([
-            self.automation_id, self.control_type, self.class_name,
-            self.name, self.value, self.help_text, self.accessible_name
-        ])
+        # Every selector field carries a positive weight
+        return self._entropy_score > 0
 
 
 class Target(BaseModel):
@@ -99,13 +126,8 @@ class Target(BaseModel):
     text: Optional[str] = Field(None, description="Text content for operations")
     region: Optional[Dict[str, int]] = Field(None, description="Screen region (x, y, width, height)")
     
-    @validator('file_path')
-    def validate_file_path(cls, v):
-        if v and not isinstance(v, str):
-            raise ValueError("File path must be a string")
-        return v
-    
-    @validator('region')
+    @field_validator('region')
+    @classmethod
     def validate_region(cls, v):
         if v:
             required_keys = {'x', 'y', 'width', 'height'}
@@ -121,48 +143,22 @@ class ActionStep(BaseModel):
     name: str = Field(..., description="Human-readable step name")
     action: ActionType = Field(..., description="Action to perform")
     target: Target = Field(..., description="Target for the action")
-    timeout: int = Field(10, description="Timeout in seconds")
-    retry_attempts: int = Field(3, description="Number of retry attempts")
+    timeout: int = Field(10, ge=1, le=300, description="Timeout in seconds")
+    retry_attempts: int = Field(3, ge=1, le=10, description="Number of retry attempts")
     retry_delay: float = Field(1.0, description="Delay between retries in seconds")
     verify_after: bool = Field(True, description="Whether to verify action success")
     continue_on_failure: bool = Field(False, description="Continue recipe if step fails")
-    
-    @validator('timeout')
-    def validate_timeout(cls, v):
-        if v < 1 or v > 300:
-            raise ValueError("Timeout must be between 1 and 300 seconds")
-        return v
-    
-    @validator('retry_attempts')
-    def validate_retry_attempts(cls, v):
-        if v < 1 or v > 10:
-            raise ValueError("Retry attempts must be between 1 and 10")
-        return v
 
 
 class Recipe(BaseModel):
     """Complete automation recipe specification."""
-    name: str = Field(..., description="Recipe name")
+    name: str = Field(..., pattern=r'^[a-zA-Z][a-zA-Z0-9_-]*$', description="Recipe name")
     description: str = Field(..., description="Recipe description")
     version: str = Field("1.0", description="Recipe version")
     author: Optional[str] = Field(None, description="Recipe author")
     tags: List[str] = Field(default_factory=list, description="Recipe tags")
     variables: Dict[str, Any] = Field(default_factory=dict, description="Recipe variables")
-    steps: List[ActionStep] = Field(..., description="Automation steps")
-    
-    @validator('name')
-    def validate_name(cls, v):
-        if not re.match(r'^[a-zA-Z][a-zA-Z0-9_-]*$', v):
-            raise ValueError("Recipe name must start with letter and contain only letters, numbers, underscores, and hyphens")
-        return v
-    
-    @validator('steps')
-    def validate_steps(cls, v):
-        if not v:
-            raise ValueError("Recipe must contain at least one step")
-        if len(v) > 100:
-            raise ValueError("Recipe cannot contain more than 100 steps")
-        return v
+    steps: List[ActionStep] = Field(..., min_length=1, max_length=100, description="Automation steps")
     
     def get_variable(self, key: str, default: Any = None) -> Any:
         """Get recipe variable value."""
@@ -172,12 +168,17 @@ class Recipe(BaseModel):
         """Substitute variables in text using ${variable} syntax."""
         if not isinstance(text, str):
             return text
-        
-        def replace_var(match):
-            var_name = match.group(1)
-            return str(self.variables.get(var_name, match.group(0)))
-        
-        return re.sub(r'\$\{([^}]+)\}', replace_var, text)
+        return _VariableTemplate(text).safe_substitute(self.variables)
+
+
+# Field combinations tried, in order, when an AutomationId selector stops matching
+SELECTOR_FALLBACK_FIELDS = (
+    ('control_type', 'name'),
+    ('class_name', 'name'),
+)
+
+# Actions whose success should be verified after execution
+VERIFIABLE_ACTIONS = frozenset({ActionType.CLICK, ActionType.TYPE})
 
 
 class RecipeValidationError(Exception):
@@ -193,30 +194,31 @@ class RecipeValidator:
         """Validate recipe and return list of warnings/issues."""
         warnings = []
         
-        # Check for duplicate step names
-        step_names = [step.name for step in recipe.steps]
-        duplicates = [name for name in set(step_names) if step_names.count(name) > 1]
+        # Check names, timeouts, selector quality and verification in a single pass
+        name_counts = Counter()
+        long_timeouts = []
+        weak_selectors = []
+        no_verify = []
+        for step in recipe.steps:
+            name_counts[step.name] += 1
+            
+            if step.timeout > 60:
+                long_timeouts.append(step.name)
+            
+            element = step.target.element
+            if element and element.has_selectors() and element.get_selector_entropy_score() < 5:  # Low entropy threshold
+                weak_selectors.append(step.name)
+            
+            if not step.verify_after and step.action in VERIFIABLE_ACTIONS:
+                no_verify.append(step.name)
+        
+        duplicates = [name for name, count in name_counts.items() if count > 1]
         if duplicates:
             warnings.append(f"Duplicate step names found: {duplicates}")
-        
-        # Check for unrealistic timeouts
-        long_timeouts = [step.name for step in recipe.steps if step.timeout > 60]
         if long_timeouts:
             warnings.append(f"Steps with long timeouts (>60s): {long_timeouts}")
-        
-        # Check for selector quality
-        weak_selectors = []
-        for step in recipe.steps:
-            if step.target.element and step.target.element.has_selectors():
-                score = step.target.element.get_selector_entropy_score()
-                if score < 5:  # Low entropy threshold
-                    weak_selectors.append(step.name)
-        
         if weak_selectors:
             warnings.append(f"Steps with weak selectors (consider using AutomationId): {weak_selectors}")
-        
-        # Check for missing verification
-        no_verify = [step.name for step in recipe.steps if not step.verify_after and step.action in [ActionType.CLICK, ActionType.TYPE]]
         if no_verify:
             warnings.append(f"Steps without verification: {no_verify}")
         
@@ -225,26 +227,21 @@ class RecipeValidator:
     @staticmethod
     def validate_selector_fallbacks(element: ElementSelector) -> List[ElementSelector]:
         """Generate fallback selectors for self-healing automation."""
-        fallbacks = []
-        
-        if element.automation_id:
-            # Fallback 1: ControlType + Name
-            if element.control_type and element.name:
-                fallbacks.append(ElementSelector(
-                    control_type=element.control_type,
-                    name=element.name,
-                    index=element.index
-                ))
-            
-            # Fallback 2: ClassName + Name
-            if element.class_name and element.name:
-                fallbacks.append(ElementSelector(
-                    class_name=element.class_name,
-                    name=element.name,
-                    index=element.index
-                ))
-        
-        return fallbacks
+        return list(_selector_fallbacks(element))
+
+
+@lru_cache(maxsize=1024)
+def _selector_fallbacks(element: ElementSelector) -> Tuple[ElementSelector, ...]:
+    """Build fallback selectors, memoized per (frozen, hashable) selector."""
+    if not element.automation_id:
+        return ()
+    
+    return tuple(
+        ElementSelector(index=element.index, max_depth=element.max_depth,
+                        **{field: getattr(element, field) for field in fields})
+        for fields in SELECTOR_FALLBACK_FIELDS
+        if all(getattr(element, field) for field in fields)
+    )
 
 
 def load_recipe_from_dict(data: Dict[str, Any]) -> Recipe:
@@ -7,6 +7,7 @@ and provides comprehensive logging and error handling.
 import os
 import sys
 import time
+from contextlib import ExitStack
 import yaml
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -27,6 +28,15 @@ from automator.providers.ocr import OCRProvider
 app = typer.Typer(help="Windows Desktop Automator - Execute automation recipes")
 console = Console()
 
+# Prefer the libyaml-backed loader; fall back to pure Python when it isn't compiled in
+YamlSafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def load_recipe_yaml(recipe_path: str) -> Dict[str, Any]:
+    """Parse a recipe YAML file into a dictionary."""
+    with open(recipe_path, 'rb') as f:
+        return yaml.load(f, Loader=YamlSafeLoader)
+
 
 class AutomationOrchestrator:
     """Main orchestrator for executing automation recipes."""
@@ -53,9 +63,7 @@ class AutomationOrchestrator:
             True if recipe loaded successfully
         """
         try:
-            with open(recipe_path, 'r', encoding='utf-8') as f:
-                recipe_data = yaml.safe_load(f)
-            
+            recipe_data = load_recipe_yaml(recipe_path)
             self._recipe = load_recipe_from_dict(recipe_data)
             
             console.print(f"✅ Loaded recipe: {self._recipe.name}")
@@ -88,16 +96,33 @@ class AutomationOrchestrator:
         
         success = True
         
-        with Progress() as progress:
+        # Consecutive steps on the same element share one UI batch, so a
+        # wait→click→verify sequence resolves the element only once
+        ui_batch = ExitStack()
+        batch_element = None
+        
+        with Progress() as progress, ui_batch:
             task = progress.add_task("Executing steps...", total=len(self._recipe.steps))
             
             for i, step in enumerate(self._recipe.steps):
                 self._current_step = i + 1
                 
+                if step.target.element is None or step.target.element != batch_element:
+                    ui_batch.close()
+                    ui_batch.enter_context(self.ui_provider.batch())
+                    batch_element = step.target.element
+                
                 console.print(f"\n📍 Step {self._current_step}/{len(self._recipe.steps)}: {step.name}")
                 
                 step_success = self._execute_step(step)
                 
+                # A background verification of this or an earlier step failed
+                failed_verification = self.ui_provider.failed_verification
+                if failed_verification:
+                    console.print(f"❌ Verification failed: {failed_verification}")
+                    success = False
+                    break
+                
                 if step_success:
                     console.print(f"✅ Step completed: {step.name}")
                 else:
@@ -108,6 +133,11 @@ class AutomationOrchestrator:
                 
                 progress.update(task, advance=1)
         
+        # Click/type verifications may still be running in the background
+        if success and not self.ui_provider.finish_verifications():
+            console.print("❌ Verification of a completed step failed")
+            success = False
+        
         duration = time.time() - self._start_time
         
         if success:
@@ -166,6 +196,8 @@ class AutomationOrchestrator:
                 last_error = e
                 
                 if attempt < step.retry_attempts:
+                    # Re-resolve elements on retry in case the cached one was a stale match
+                    self.ui_provider.reset_batch()
                     automator_logger.log_step_retry("step_execution", f"execute_{step.action}", 
                                                   step.name, attempt, step.retry_attempts, e)
                     console.print(f"   ⚠️  Retry {attempt}/{step.retry_attempts}: {e}")
@@ -183,7 +215,7 @@ class AutomationOrchestrator:
             return step
         
         # Create a copy of the step with substituted values
-        step_dict = step.dict()
+        step_dict = step.model_dump()
         
         # Recursively substitute variables in all string values
         def substitute_recursive(obj):
@@ -417,9 +449,7 @@ def validate(recipe_path: str = typer.Argument(..., help="Path to recipe YAML fi
         sys.exit(1)
     
     try:
-        with open(recipe_path, 'r', encoding='utf-8') as f:
-            recipe_data = yaml.safe_load(f)
-        
+        recipe_data = load_recipe_yaml(recipe_path)
         recipe = load_recipe_from_dict(recipe_data)
         
         console.print(f"✅ Recipe is valid: {recipe.name}")
@@ -3,19 +3,48 @@ UI automation provider using pywinauto with UIA backend.
 Implements wait→act→verify pattern with intelligent element location and fallback strategies.
 """
 
+import ctypes
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
+import comtypes
 import pywinauto
 from pywinauto import Application
 from pywinauto.controls.uiawrapper import UIAWrapper
 from pywinauto.findwindows import ElementNotFoundError
+from pywinauto.uia_defines import IUIA
+from pywinauto.uia_element_info import UIAElementInfo
 import uiautomation as auto
 
 from automator.core.dsl import ElementSelector, WindowSelector
 from automator.core.logger import automator_logger
 
 
+# State name -> (UIAWrapper method, UIA property id name, cached value converter).
+# Lets several state checks on one element share a single BuildUpdatedCache call.
+_ELEMENT_STATES = {
+    'visible': ('is_visible', 'UIA_IsOffscreenPropertyId', lambda v: not v),
+    'enabled': ('is_enabled', 'UIA_IsEnabledPropertyId', bool),
+    'focused': ('has_focus', 'UIA_HasKeyboardFocusPropertyId', bool),
+    'selected': ('is_selected', 'UIA_SelectionItemIsSelectedPropertyId', bool),
+    'minimized': ('is_minimized', 'UIA_WindowWindowVisualStatePropertyId', lambda v: v == 2),
+}
+
+# pywinauto search keyword -> UIA property id name, for native element searches
+_CRITERIA_PROPERTIES = {
+    'auto_id': 'UIA_AutomationIdPropertyId',
+    'title': 'UIA_NamePropertyId',
+    'class_name': 'UIA_ClassNamePropertyId',
+    'control_type': 'UIA_ControlTypePropertyId',
+}
+
+# Resolved element key within a batch: (element selector, window selector, app name)
+ElementCacheKey = Tuple[ElementSelector, Optional[WindowSelector], Optional[str]]
+
+
 class UIProvider:
     """Provider for UI automation using pywinauto with UIA backend."""
     
@@ -24,8 +53,46 @@ class UIProvider:
         # Force UIA backend
         pywinauto.backend = 'uia'
         self._applications: Dict[str, Application] = {}
-        self._element_cache: Dict[str, UIAWrapper] = {}
+        # Process-wide UIA root, reused instead of connecting an Application per lookup
+        self._uia = IUIA()
+        self._desktop = pywinauto.Desktop(backend='uia')
         self._last_screenshot_path: Optional[str] = None
+        # Per-thread {ElementCacheKey: element} map while a batch is active
+        self._batch_state = threading.local()
+        self._verification_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_verifications: List[Tuple[str, str, str, Future]] = []
+        # First failed background verification; kept until cleanup so the run fails
+        self._verification_failure: Optional[str] = None
+    
+    @contextmanager
+    def batch(self) -> Iterator['UIProvider']:
+        """
+        Coalesce element lookups issued inside the block.
+        
+        While active, repeated lookups of the same selector on this thread reuse
+        the element resolved by the first lookup instead of walking the tree again.
+        The orchestrator keeps one batch open across consecutive steps on the same
+        element, so a wait→click→verify sequence resolves it only once.
+        Nested blocks join the outermost batch.
+        """
+        state = self._batch_state
+        if getattr(state, 'elements', None) is not None:
+            yield self
+            return
+        
+        # comtypes releases each IUIAutomationElement once its last Python
+        # reference goes away, so dropping the dict frees the batch's elements
+        state.elements = {}
+        try:
+            yield self
+        finally:
+            state.elements = None
+    
+    def reset_batch(self):
+        """Forget elements resolved in the active batch so later lookups search afresh."""
+        elements = getattr(self._batch_state, 'elements', None)
+        if elements is not None:
+            elements.clear()
     
     def wait_for_window(self, window_selector: WindowSelector, timeout: int = 10, 
                        app_name: str = None) -> bool:
@@ -40,7 +107,9 @@ class UIProvider:
         Returns:
             True if window found and ready
         """
-        step_id = automator_logger.log_step_start("wait_for_window", str(window_selector), 
+        self._drain_verifications()
+        target = str(window_selector)
+        step_id = automator_logger.log_step_start("wait_for_window", target, 
                                                   timeout=timeout, app_name=app_name)
         
         start_time = time.time()
@@ -52,7 +121,7 @@ class UIProvider:
                 if window and window.is_visible():
                     # Additional readiness checks
                     if self._is_window_ready(window):
-                        automator_logger.log_step_success(step_id, "wait_for_window", str(window_selector))
+                        automator_logger.log_step_success(step_id, "wait_for_window", target)
                         return True
                 
                 time.sleep(0.5)
@@ -62,7 +131,7 @@ class UIProvider:
                 time.sleep(0.5)
         
         error = last_error or TimeoutError(f"Window not found within {timeout} seconds")
-        automator_logger.log_step_failure(step_id, "wait_for_window", str(window_selector), error)
+        automator_logger.log_step_failure(step_id, "wait_for_window", target, error)
         return False
     
     def wait_for_element(self, element_selector: ElementSelector, window_selector: WindowSelector = None,
@@ -79,7 +148,9 @@ class UIProvider:
         Returns:
             True if element found and ready
         """
-        step_id = automator_logger.log_step_start("wait_for_element", str(element_selector), 
+        self._drain_verifications()
+        target = str(element_selector)
+        step_id = automator_logger.log_step_start("wait_for_element", target, 
                                                   timeout=timeout, window_selector=str(window_selector))
         
         start_time = time.time()
@@ -88,8 +159,8 @@ class UIProvider:
         while time.time() - start_time < timeout:
             try:
                 element = self._find_element(element_selector, window_selector, app_name)
-                if element and element.is_visible() and element.is_enabled():
-                    automator_logger.log_step_success(step_id, "wait_for_element", str(element_selector))
+                if element and all(self._read_states(element, ('visible', 'enabled')).values()):
+                    automator_logger.log_step_success(step_id, "wait_for_element", target)
                     return True
                 
                 time.sleep(0.5)
@@ -99,7 +170,7 @@ class UIProvider:
                 time.sleep(0.5)
         
         error = last_error or TimeoutError(f"Element not found within {timeout} seconds")
-        automator_logger.log_step_failure(step_id, "wait_for_element", str(element_selector), error)
+        automator_logger.log_step_failure(step_id, "wait_for_element", target, error)
         return False
     
     def click_element(self, element_selector: ElementSelector, window_selector: WindowSelector = None,
@@ -112,22 +183,26 @@ class UIProvider:
             window_selector: Parent window selector
             app_name: Application name
             click_type: Type of click (left, right, double)
-            verify: Verify click success
+            verify: Verify click success in the background; a failure is reported
+                by failed_verification and finish_verifications()
             
         Returns:
             True if click successful
         """
-        step_id = automator_logger.log_step_start("click_element", str(element_selector), 
+        # Input could change what a pending verification reads, so finish those first
+        self._drain_verifications()
+        target = str(element_selector)
+        step_id = automator_logger.log_step_start("click_element", target, 
                                                   click_type=click_type, verify=verify)
         
         try:
             element = self._find_element(element_selector, window_selector, app_name)
             if not element:
-                raise ElementNotFoundError(f"Element not found: {element_selector}")
+                raise ElementNotFoundError(f"Element not found: {target}")
             
             # Ensure element is ready for interaction
-            if not element.is_visible() or not element.is_enabled():
-                raise RuntimeError(f"Element not ready for interaction: {element_selector}")
+            if not all(self._read_states(element, ('visible', 'enabled')).values()):
+                raise RuntimeError(f"Element not ready for interaction: {target}")
             
             # Scroll element into view if needed
             try:
@@ -148,15 +223,16 @@ class UIProvider:
             # Brief wait for UI to respond
             time.sleep(0.2)
             
-            # Verify click if requested
+            # Verify click if requested, off the critical path
             if verify:
-                self._verify_click_success(element, element_selector)
+                self._submit_verification(step_id, "click_element", target, self._verify_click_success,
+                                          element, element_selector)
             
-            automator_logger.log_step_success(step_id, "click_element", str(element_selector))
+            automator_logger.log_step_success(step_id, "click_element", target)
             return True
             
         except Exception as e:
-            automator_logger.log_step_failure(step_id, "click_element", str(element_selector), e)
+            automator_logger.log_step_failure(step_id, "click_element", target, e)
             return False
     
     def type_text(self, text: str, element_selector: ElementSelector = None, 
@@ -171,12 +247,17 @@ class UIProvider:
             window_selector: Parent window selector
             app_name: Application name
             clear_first: Clear existing text first
-            verify: Verify text was entered
+            verify: Verify text was entered in the background; a failure is reported
+                by failed_verification and finish_verifications()
             
         Returns:
             True if typing successful
         """
-        step_id = automator_logger.log_step_start("type_text", f"'{text}' -> {element_selector}", 
+        # Input could change what a pending verification reads, so finish those first
+        self._drain_verifications()
+        selector = str(element_selector)
+        target = f"'{text}' -> {selector}"
+        step_id = automator_logger.log_step_start("type_text", target, 
                                                   clear_first=clear_first, verify=verify)
         
         try:
@@ -184,7 +265,7 @@ class UIProvider:
             if element_selector:
                 element = self._find_element(element_selector, window_selector, app_name)
                 if not element:
-                    raise ElementNotFoundError(f"Element not found: {element_selector}")
+                    raise ElementNotFoundError(f"Element not found: {selector}")
                 
                 # Focus the element
                 element.set_focus()
@@ -204,15 +285,16 @@ class UIProvider:
             # Brief wait for UI to respond
             time.sleep(0.2)
             
-            # Verify text was entered if requested
+            # Verify text was entered if requested, off the critical path
             if verify and element:
-                self._verify_text_input(element, text, element_selector)
+                self._submit_verification(step_id, "type_text", target, self._verify_text_input,
+                                          element, text, element_selector)
             
-            automator_logger.log_step_success(step_id, "type_text", f"'{text}' -> {element_selector}")
+            automator_logger.log_step_success(step_id, "type_text", target)
             return True
             
         except Exception as e:
-            automator_logger.log_step_failure(step_id, "type_text", f"'{text}' -> {element_selector}", e)
+            automator_logger.log_step_failure(step_id, "type_text", target, e)
             return False
     
     def send_hotkey(self, keys: str, window_selector: WindowSelector = None, 
@@ -228,6 +310,8 @@ class UIProvider:
         Returns:
             True if hotkey sent successfully
         """
+        # Input could change what a pending verification reads, so finish those first
+        self._drain_verifications()
         step_id = automator_logger.log_step_start("send_hotkey", keys, 
                                                   window_selector=str(window_selector))
         
@@ -265,12 +349,13 @@ class UIProvider:
         Returns:
             Element text content or None if not found
         """
-        step_id = automator_logger.log_step_start("get_element_text", str(element_selector))
+        target = str(element_selector)
+        step_id = automator_logger.log_step_start("get_element_text", target)
         
         try:
             element = self._find_element(element_selector, window_selector, app_name)
             if not element:
-                raise ElementNotFoundError(f"Element not found: {element_selector}")
+                raise ElementNotFoundError(f"Element not found: {target}")
             
             # Try different methods to get text
             text = None
@@ -288,12 +373,12 @@ class UIProvider:
             if text is None:
                 text = ""
             
-            automator_logger.log_step_success(step_id, "get_element_text", str(element_selector), 
+            automator_logger.log_step_success(step_id, "get_element_text", target, 
                                             result=f"'{text}'")
             return text
             
         except Exception as e:
-            automator_logger.log_step_failure(step_id, "get_element_text", str(element_selector), e)
+            automator_logger.log_step_failure(step_id, "get_element_text", target, e)
             return None
     
     def verify_element_state(self, element_selector: ElementSelector, expected_state: str,
@@ -310,43 +395,36 @@ class UIProvider:
         Returns:
             True if element is in expected state
         """
-        step_id = automator_logger.log_step_start("verify_element_state", 
-                                                  f"{element_selector} -> {expected_state}")
+        selector = str(element_selector)
+        target = f"{selector} -> {expected_state}"
+        step_id = automator_logger.log_step_start("verify_element_state", target)
         
         try:
             element = self._find_element(element_selector, window_selector, app_name)
             if not element:
-                raise ElementNotFoundError(f"Element not found: {element_selector}")
+                raise ElementNotFoundError(f"Element not found: {selector}")
             
             # Check state based on expected_state
-            result = False
-            if expected_state == "visible":
-                result = element.is_visible()
-            elif expected_state == "enabled":
-                result = element.is_enabled()
-            elif expected_state == "focused":
-                result = element.has_focus()
-            elif expected_state == "selected":
-                try:
-                    result = element.is_selected()
-                except Exception:
-                    result = False
-            else:
+            if expected_state not in ('visible', 'enabled', 'focused', 'selected'):
                 raise ValueError(f"Invalid expected state: {expected_state}")
             
+            try:
+                result = self._read_states(element, (expected_state,))[expected_state]
+            except Exception:
+                if expected_state != "selected":
+                    raise
+                result = False
+            
             if result:
-                automator_logger.log_step_success(step_id, "verify_element_state", 
-                                                f"{element_selector} -> {expected_state}")
+                automator_logger.log_step_success(step_id, "verify_element_state", target)
             else:
                 error = RuntimeError(f"Element not in expected state: {expected_state}")
-                automator_logger.log_step_failure(step_id, "verify_element_state", 
-                                                f"{element_selector} -> {expected_state}", error)
+                automator_logger.log_step_failure(step_id, "verify_element_state", target, error)
             
             return result
             
         except Exception as e:
-            automator_logger.log_step_failure(step_id, "verify_element_state", 
-                                            f"{element_selector} -> {expected_state}", e)
+            automator_logger.log_step_failure(step_id, "verify_element_state", target, e)
             return False
     
     def _find_window(self, window_selector: WindowSelector, app_name: str = None) -> Optional[UIAWrapper]:
@@ -373,19 +451,49 @@ class UIProvider:
                 search_criteria['class_name'] = window_selector.class_name
             if window_selector.process_id:
                 search_criteria['process'] = window_selector.process_id
+            elif app:
+                search_criteria['process'] = app.process
+            
+            if not search_criteria:
+                return None
+            
+            # Find any matching top-level window from the shared desktop root
+            windows = self._desktop.windows(**search_criteria)
+            return windows[0] if windows else None
             
-            # Find window
-            if app:
-                return app.window(**search_criteria)
-            else:
-                # Find any matching window
-                return Application(backend='uia').connect(**search_criteria).top_window()
-                
         except Exception:
             return None
     
     def _find_element(self, element_selector: ElementSelector, window_selector: WindowSelector = None,
                      app_name: str = None) -> Optional[UIAWrapper]:
+        """Find element, reusing the element resolved earlier in the active batch."""
+        elements = getattr(self._batch_state, 'elements', None)
+        if elements is None:
+            return self._locate_element(element_selector, window_selector, app_name)
+        
+        key = (element_selector, window_selector, app_name)
+        element = elements.get(key)
+        if element is not None and not self._is_element_alive(element):
+            element = None
+        if element is None:
+            element = self._locate_element(element_selector, window_selector, app_name)
+            if element is not None:
+                elements[key] = element
+            else:
+                elements.pop(key, None)
+        return element
+    
+    @staticmethod
+    def _is_element_alive(element: UIAWrapper) -> bool:
+        """Check that the element's UI still exists."""
+        try:
+            element.element_info.element.GetRuntimeId()
+            return True
+        except Exception:
+            return False
+    
+    def _locate_element(self, element_selector: ElementSelector, window_selector: WindowSelector = None,
+                        app_name: str = None) -> Optional[UIAWrapper]:
         """Find element with fallback strategies."""
         try:
             # Get parent window
@@ -395,9 +503,17 @@ class UIProvider:
             elif app_name and app_name in self._applications:
                 window = self._applications[app_name].top_window()
             
-            if not window:
-                # Try desktop if no window found
-                window = Application(backend='uia').connect(path='explorer.exe').top_window()
+            if window:
+                roots = [window]
+            else:
+                # Try the foreground window first; it is often the console that started
+                # the run, so widen the search to the desktop root when it has no match
+                roots = [UIAWrapper(UIAElementInfo())]
+                foreground = ctypes.windll.user32.GetForegroundWindow()
+                if foreground:
+                    roots.insert(0, UIAWrapper(UIAElementInfo(foreground)))
+            
+            index = element_selector.index or 0
             
             # Build search criteria with entropy-based ordering
             search_criteria = []
@@ -427,31 +543,172 @@ class UIProvider:
                 search_criteria.append({'control_type': element_selector.control_type})
             
             # Try each criteria set in order
-            for criteria in search_criteria:
-                try:
-                    elements = window.descendants(**criteria)
-                    if elements:
-                        # Use index if specified
-                        index = element_selector.index or 0
-                        if index < len(elements):
-                            return elements[index]
-                except Exception:
-                    continue
+            for root in roots:
+                for criteria in search_criteria:
+                    element = self._search_scoped(root, criteria, index, element_selector.max_depth)
+                    if element:
+                        return element
             
             return None
             
         except Exception:
             return None
     
+    def _search_scoped(self, root: UIAWrapper, criteria: Dict[str, Any], index: int,
+                       max_depth: Optional[int]) -> Optional[UIAWrapper]:
+        """
+        Search the root's subtree level by level down to max_depth, then all of it.
+        
+        Most targets sit within a few levels of the window, so the bounded walk
+        finds them without enumerating the whole tree of large applications; on a
+        miss the full subtree is searched so deeper targets are still found.
+        Without max_depth only the direct children are tried first.
+        
+        The walk costs one cross-process FindAll per node above max_depth, so a
+        target it misses pays those round-trips on top of the full search.
+        An index above 0 counts matches in document order (each element before
+        its children), which a level-by-level walk cannot, so it goes straight
+        to the full search. So does an AutomationId: it is unambiguous, so the
+        condition is evaluated natively inside UIA and non-matching nodes are
+        never marshalled.
+        """
+        iuia = self._uia
+        try:
+            properties = {}
+            for keyword, value in criteria.items():
+                property_id = getattr(iuia.UIA_dll, _CRITERIA_PROPERTIES[keyword])
+                properties[property_id] = iuia.known_control_types[value] if keyword == 'control_type' else value
+            
+            # Raw view, matching what an uncached FindAll searches
+            cache_request = iuia.iuia.CreateCacheRequest()
+            cache_request.TreeFilter = iuia.iuia.RawViewCondition
+            for property_id in properties:
+                cache_request.AddProperty(property_id)
+            
+            # Walk one level per FindAll call, matching against the cached properties
+            walk = index == 0 and 'auto_id' not in criteria
+            level = [root.element_info.element] if walk else []
+            for _ in range(max_depth or 1):
+                if not level:
+                    break
+                next_level = []
+                for parent in level:
+                    children = parent.FindAllBuildCache(iuia.tree_scope['children'],
+                                                        iuia.true_condition, cache_request)
+                    for i in range(children.Length if children else 0):
+                        child = children.GetElement(i)
+                        if all(child.GetCachedPropertyValue(property_id) == value
+                               for property_id, value in properties.items()):
+                            return UIAWrapper(UIAElementInfo(child))
+                        next_level.append(child)
+                if not next_level:
+                    return None  # Whole subtree searched
+                level = next_level
+            
+            # Native search of the whole subtree, as a fallback or straight away
+            condition = None
+            for property_id, value in properties.items():
+                property_condition = iuia.iuia.CreatePropertyCondition(property_id, value)
+                condition = (property_condition if condition is None
+                             else iuia.iuia.CreateAndCondition(condition, property_condition))
+            
+            scope = iuia.tree_scope['descendants']
+            root_element = root.element_info.element
+            if index == 0:
+                found = root_element.FindFirstBuildCache(scope, condition, cache_request)
+            else:
+                matches = root_element.FindAllBuildCache(scope, condition, cache_request)
+                found = matches.GetElement(index) if matches and index < matches.Length else None
+            if found:
+                return UIAWrapper(UIAElementInfo(found))
+        except Exception:
+            pass
+        
+        return None
+    
     def _is_window_ready(self, window: UIAWrapper) -> bool:
         """Check if window is ready for automation."""
         try:
-            return (window.is_visible() and 
-                   window.is_enabled() and 
-                   not window.is_minimized())
+            states = self._read_states(window, ('visible', 'enabled', 'minimized'))
+            return states['visible'] and states['enabled'] and not states['minimized']
         except Exception:
             return False
     
+    def _read_states(self, element: UIAWrapper, states: Tuple[str, ...]) -> Dict[str, bool]:
+        """
+        Read several element states with one cross-process round-trip.
+        
+        All requested properties go into a single UIA cache request; if the
+        element's provider rejects it, fall back to the per-property wrapper calls.
+        """
+        iuia = self._uia
+        try:
+            cache_request = iuia.iuia.CreateCacheRequest()
+            property_ids = {}
+            for state in states:
+                property_ids[state] = getattr(iuia.UIA_dll, _ELEMENT_STATES[state][1])
+                cache_request.AddProperty(property_ids[state])
+            
+            cached = element.element_info.element.BuildUpdatedCache(cache_request)
+            values = {state: cached.GetCachedPropertyValue(property_id)
+                      for state, property_id in property_ids.items()}
+            # Unsupported properties come back as a non-null sentinel, which is truthy;
+            # an element lacking the pattern doesn't have the state
+            not_supported = iuia.iuia.ReservedNotSupportedValue
+            return {
+                state: False if value == not_supported else _ELEMENT_STATES[state][2](value)
+                for state, value in values.items()
+            }
+        except Exception:
+            return {state: getattr(element, _ELEMENT_STATES[state][0])() for state in states}
+    
+    @property
+    def failed_verification(self) -> Optional[str]:
+        """Description of the first background verification that failed, if any."""
+        return self._verification_failure
+    
+    def finish_verifications(self) -> bool:
+        """
+        Wait for all background verifications still pending.
+        
+        Must be checked before declaring a run successful, since deferred
+        verifications may fail after their action has returned True.
+        
+        Returns:
+            True if no background verification has failed
+        """
+        self._drain_verifications()
+        return self._verification_failure is None
+    
+    def _submit_verification(self, step_id: str, action: str, target: str, verify_func, *args):
+        """Run a post-action verification in a worker thread."""
+        if self._verification_executor is None:
+            # Worker threads need their own COM initialization for UIA calls
+            self._verification_executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="ui-verify", initializer=comtypes.CoInitializeEx)
+        
+        future = self._verification_executor.submit(verify_func, *args)
+        self._pending_verifications.append((step_id, action, target, future))
+    
+    def _drain_verifications(self) -> bool:
+        """
+        Wait for pending background verifications and log any failures.
+        
+        Returns:
+            True if all pending verifications succeeded
+        """
+        success = True
+        pending, self._pending_verifications = self._pending_verifications, []
+        for step_id, action, target, future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                success = False
+                automator_logger.log_step_failure(step_id, action, target, e)
+                if self._verification_failure is None:
+                    self._verification_failure = f"{action} {target}: {e}"
+        return success
+    
     def _verify_click_success(self, element: UIAWrapper, element_selector: ElementSelector):
         """Verify click was successful."""
         # Basic verification - element should still be accessible
@@ -479,5 +736,9 @@ class UIProvider:
     
     def cleanup(self):
         """Clean up provider resources."""
+        self._drain_verifications()
+        if self._verification_executor is not None:
+            self._verification_executor.shutdown(wait=True)
+            self._verification_executor = None
+        self._verification_failure = None
         self._applications.clear()
-        self._element_cache.clear()
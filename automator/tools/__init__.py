@@ -0,0 +1 @@
+# Standalone recipe tools
\ No newline at end of file
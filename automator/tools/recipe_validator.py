@@ -0,0 +1,169 @@
+"""
+Simple recipe validator that doesn't require external dependencies.
+Tests recipe YAML structure and basic validation without importing the
+automation stack; validate_recipe.py is its command-line entry point.
+"""
+
+import hashlib
+import json
+import yaml
+import sys
+import os
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+try:
+    import orjson
+    json_loads, json_dumps = orjson.loads, orjson.dumps
+except ImportError:  # Standard library parser is slower but equivalent
+    json_loads = json.loads
+    def json_dumps(data):
+        return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+# Compiled JSON copies of recipes live next to their YAML source
+RECIPE_CACHE_DIR = '.cache'
+
+RECIPE_REQUIRED_FIELDS = frozenset({'name', 'description', 'steps'})
+STEP_REQUIRED_FIELDS = frozenset({'name', 'action', 'target'})
+
+# ASCII stand-ins for the report's status markers on consoles that can't encode them
+EMOJI_FALLBACKS = str.maketrans({
+    '🔍': '[*]',
+    '✅': '[OK]',
+    '⚠': '[!]',
+    '\ufe0f': '',  # Emoji variation selector following ⚠
+    '❌': '[X]',
+})
+
+def write_report(lines):
+    """Write report lines to stdout with a single write call."""
+    text = "\n".join(lines) + "\n"
+    try:
+        sys.stdout.write(text)
+    except UnicodeEncodeError:
+        encoding = sys.stdout.encoding or 'ascii'
+        text = text.translate(EMOJI_FALLBACKS)
+        sys.stdout.write(text.encode(encoding, errors='replace').decode(encoding))
+
+def recipe_cache_path(recipe_path):
+    """Return the path of the compiled JSON copy of a YAML recipe."""
+    directory, filename = os.path.split(recipe_path)
+    name = os.path.splitext(filename)[0]
+    return os.path.join(directory, RECIPE_CACHE_DIR, f"{name}.json")
+
+def recipe_digest(source):
+    """Hash YAML recipe bytes so a compiled copy can be matched to its source."""
+    return hashlib.blake2b(source).hexdigest()
+
+def compile_recipe(recipe_path):
+    """Parse a YAML recipe once and write its compiled JSON copy."""
+    with open(recipe_path, 'rb') as f:
+        source = f.read()
+    recipe_data = yaml.load(source, Loader=SafeLoader)
+    
+    cache_path = recipe_cache_path(recipe_path)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, 'wb') as f:
+        f.write(json_dumps({'digest': recipe_digest(source), 'recipe': recipe_data}))
+    return cache_path
+
+def load_recipe_data(recipe_path):
+    """
+    Load recipe data, preferring a compiled JSON copy of the same YAML bytes.
+    
+    The copy is matched by content digest rather than modification time, which
+    can tie or be restored (cp -p, archive extraction) while the YAML differs.
+    """
+    with open(recipe_path, 'rb') as f:
+        source = f.read()
+    
+    try:
+        with open(recipe_cache_path(recipe_path), 'rb') as f:
+            compiled = json_loads(f.read())
+        if compiled['digest'] == recipe_digest(source):
+            return compiled['recipe']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # No usable compiled copy; YAML is the source of truth
+    
+    return yaml.load(source, Loader=SafeLoader)
+
+def validate_recipe_structure(recipe_path):
+    """Validate recipe structure without importing full automation stack."""
+    report = [f"🔍 Validating recipe: {recipe_path}"]
+    
+    try:
+        recipe_data = load_recipe_data(recipe_path)
+        
+        # Basic structure validation
+        if not isinstance(recipe_data, dict):
+            raise ValueError("Recipe must be a mapping of fields")
+        missing = RECIPE_REQUIRED_FIELDS - recipe_data.keys()
+        if missing:
+            raise ValueError(f"Missing required fields: {sorted(missing)}")
+        
+        # Validate steps
+        steps = recipe_data['steps']
+        if not isinstance(steps, list) or len(steps) == 0:
+            raise ValueError("Recipe must have at least one step")
+        if not all(isinstance(step, dict) for step in steps):
+            raise ValueError("Each step must be a mapping of fields")
+        
+        # Validate each step has required fields, one column per field
+        columns = {field: [step.get(field) for step in steps] for field in STEP_REQUIRED_FIELDS}
+        missing_steps = {
+            field: [i for i, value in enumerate(columns[field], 1) if value is None]
+            for field in sorted(STEP_REQUIRED_FIELDS)
+        }
+        incomplete = {i for missing in missing_steps.values() for i in missing}
+        if incomplete:
+            for field, missing in missing_steps.items():
+                if missing:
+                    report.append(f"   ⚠️  Steps missing field '{field}': {missing}")
+            raise ValueError(f"Steps missing required fields: {sorted(incomplete)}")
+        
+        report.append(f"✅ Recipe structure is valid!")
+        report.append(f"   Name: {recipe_data['name']}")
+        report.append(f"   Description: {recipe_data['description']}")
+        report.append(f"   Steps: {len(steps)}")
+        for i, (name, action) in enumerate(zip(columns['name'], columns['action']), 1):
+            report.append(f"   ✅ Step {i}: {name} ({action})")
+        
+        # Check for variables
+        if 'variables' in recipe_data:
+            vars_count = len(recipe_data['variables'])
+            report.append(f"   Variables: {vars_count}")
+            for var_name, var_value in recipe_data['variables'].items():
+                report.append(f"     - {var_name}: {var_value}")
+        
+        return True
+        
+    except Exception as e:
+        report.append(f"❌ Recipe validation failed: {e}")
+        return False
+    
+    finally:
+        write_report(report)
+
+def main(argv=None):
+    """Validate the recipe named on the command line, returning an exit code."""
+    # Legacy Windows consoles can't encode the emoji status markers
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8', errors='backslashreplace')
+    
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 1:
+        write_report(["Usage: python validate_recipe.py <recipe_path>"])
+        return 1
+    
+    recipe_path = args[0]
+    if not os.path.exists(recipe_path):
+        write_report([f"❌ Recipe file not found: {recipe_path}"])
+        return 1
+    
+    return 0 if validate_recipe_structure(recipe_path) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Compile YAML recipes into JSON copies that the recipe validator loads faster.
+YAML stays the source of truth; stale copies are ignored by the validator.
+"""
+
+import glob
+import os
+import sys
+
+from automator.tools.recipe_validator import compile_recipe
+
+def compile_recipes(recipe_dir='recipes'):
+    """Compile every YAML recipe in a directory, returning the failure count."""
+    failures = 0
+    for recipe_path in sorted(glob.glob(os.path.join(recipe_dir, '*.yaml'))):
+        try:
+            cache_path = compile_recipe(recipe_path)
+            print(f"✅ {recipe_path} -> {cache_path}")
+        except Exception as e:
+            print(f"❌ {recipe_path}: {e}")
+            failures += 1
+    return failures
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8', errors='backslashreplace')
+    
+    recipe_dir = sys.argv[1] if len(sys.argv) > 1 else 'recipes'
+    sys.exit(1 if compile_recipes(recipe_dir) else 0)
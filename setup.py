@@ -3,10 +3,22 @@ Setup script for Windows Desktop Automator.
 Validates environment and installs dependencies.
 """
 
+import contextlib
+import hashlib
+import importlib.metadata
+import io
 import os
+import re
 import sys
 import subprocess
 import platform
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+WHEEL_DIR = '.wheelcache'
+DOWNLOAD_WORKERS = 5
+INSTALL_STAMP = '.install_stamp'
+PIP_CACHE_DIR = os.environ.get('PIP_CACHE_DIR', str(Path.home() / '.cache' / 'automator-pip'))
 
 def check_python_version():
     """Check if Python version is 3.11 or higher."""
@@ -25,49 +37,149 @@ def check_windows_version():
     print(f"✅ Windows {platform.release()} detected")
     return True
 
+def read_requirements(path='requirements.txt'):
+    """Read requirement specifiers, skipping blank lines and comments."""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = (line.split('#', 1)[0].strip() for line in f)
+        return [line for line in lines if line]
+
+def requirements_digest(path='requirements.txt'):
+    """Hash requirements file contents for the install stamp."""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read()).hexdigest()
+
+def requirement_name(requirement):
+    """Project name of a requirement specifier."""
+    return re.split(r'[<>=!~\[;\s]', requirement, maxsplit=1)[0]
+
+def requirements_installed(requirements):
+    """Check requirements against installed package metadata without importing them."""
+    for requirement in requirements:
+        try:
+            installed_version = importlib.metadata.version(requirement_name(requirement))
+        except importlib.metadata.PackageNotFoundError:
+            return False
+        pinned_version = requirement.partition('==')[2].strip()
+        if pinned_version and installed_version != pinned_version:
+            return False
+    return True
+
+def dependencies_up_to_date(digest, requirements):
+    """Check if the last install used these requirements and they are still installed."""
+    try:
+        if Path(INSTALL_STAMP).read_text(encoding='utf-8') != digest:
+            return False
+    except OSError:
+        return False
+    return requirements_installed(requirements)
+
+def pip_env():
+    """Environment for pip runs, pointing at the persistent download cache."""
+    return os.environ | {'PIP_CACHE_DIR': PIP_CACHE_DIR}
+
+def requirement_wheel_dir(requirement):
+    """Wheel directory for one requirement and its dependencies."""
+    return os.path.join(WHEEL_DIR, requirement_name(requirement).lower())
+
+def download_requirement(requirement):
+    """
+    Build wheels for one requirement and its dependencies.
+    
+    pip wheel turns sdist-only packages into wheels here, while the network and
+    build backends are available, so the offline install never has to build.
+    Each requirement gets its own directory so concurrent runs that resolve a
+    shared dependency never write the same file.
+    """
+    subprocess.run([
+        sys.executable, '-m', 'pip', 'wheel', '--prefer-binary',
+        '-w', requirement_wheel_dir(requirement), requirement
+    ], check=True, capture_output=True, text=True, env=pip_env())
+
+def stream_pip(args):
+    """Run pip, echoing its output line by line instead of buffering it."""
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'pip', *args],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, env=pip_env()
+    )
+    for line in process.stdout:
+        sys.stdout.write(line)
+    returncode = process.wait()
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, process.args)
+
 def install_dependencies():
     """Install Python dependencies from requirements.txt."""
     try:
+        requirements = read_requirements()
+        digest = requirements_digest()
+        if dependencies_up_to_date(digest, requirements):
+            print("✅ Dependencies already installed")
+            return True
+        
         print("📦 Installing Python dependencies...")
-        result = subprocess.run([
-            sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'
-        ], check=True, capture_output=True, text=True)
+        os.makedirs(WHEEL_DIR, exist_ok=True)
+        os.makedirs(PIP_CACHE_DIR, exist_ok=True)
+        
+        # Downloads are network-bound, so fetch and build packages concurrently
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            list(executor.map(download_requirement, requirements))
+        
+        # Install everything from the local wheels without touching the network
+        find_links = [arg for requirement in requirements
+                      for arg in ('--find-links', requirement_wheel_dir(requirement))]
+        stream_pip(['install', '--no-index', *find_links, '-r', 'requirements.txt'])
+        Path(INSTALL_STAMP).write_text(digest, encoding='utf-8')
         print("✅ Dependencies installed successfully")
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to install dependencies: {e}")
-        print(f"Error output: {e.stderr}")
+        if e.stderr:
+            print(f"Error output: {e.stderr}")
         return False
 
 def create_directories():
     """Create necessary directories."""
-    directories = [
-        'artifacts/logs',
-        'artifacts/screens',
-        'artifacts/ocr_debug'
-    ]
+    artifacts_dir = 'artifacts'
+    subdirectories = ['logs', 'screens', 'ocr_debug']
+    
+    # Create the shared parent once, then only the leaf directories
+    os.makedirs(artifacts_dir, exist_ok=True)
+    for name in subdirectories:
+        try:
+            os.mkdir(os.path.join(artifacts_dir, name))
+        except FileExistsError:
+            pass
     
-    for dir_path in directories:
-        os.makedirs(dir_path, exist_ok=True)
-        print(f"✅ Created directory: {dir_path}")
+    print(f"✅ Created directories: {', '.join(f'{artifacts_dir}/{name}' for name in subdirectories)}")
 
 def run_basic_tests():
     """Run basic functionality tests."""
     print("🧪 Running basic tests...")
     
-    # Test recipe validation
+    # Test recipe validation in-process; its yaml dependency is only
+    # guaranteed once install_dependencies has run
     try:
-        result = subprocess.run([
-            sys.executable, 'validate_recipe.py', 'recipes/notepad_excel.yaml'
-        ], check=True, capture_output=True, text=True)
-        print("✅ Recipe validation test passed")
-        return True
-    except subprocess.CalledProcessError as e:
+        from automator.tools.recipe_validator import validate_recipe_structure
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            passed = validate_recipe_structure('recipes/notepad_excel.yaml')
+    except ImportError as e:
         print(f"❌ Recipe validation test failed: {e}")
         return False
+    
+    if not passed:
+        print("❌ Recipe validation test failed")
+        return False
+    print("✅ Recipe validation test passed")
+    return True
 
 def main():
     """Main setup function."""
+    # Legacy Windows consoles can't encode the emoji status markers
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8', errors='backslashreplace')
+        sys.stderr.reconfigure(encoding='utf-8', errors='backslashreplace')
+    
     print("🚀 Windows Desktop Automator Setup")
     print("=" * 40)
     
@@ -76,13 +188,18 @@ def main():
         print("\n❌ Setup failed - prerequisites not met")
         sys.exit(1)
     
-    # Create directories
-    print("\n📁 Creating directories...")
-    create_directories()
-    
-    # Install dependencies
+    # Start installing dependencies (network-bound) while local setup runs
     print("\n📦 Installing dependencies...")
-    if not install_dependencies():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        install_future = executor.submit(install_dependencies)
+        
+        # Create directories
+        print("\n📁 Creating directories...")
+        create_directories()
+        
+        dependencies_installed = install_future.result()
+    
+    if not dependencies_installed:
         print("\n❌ Setup failed - could not install dependencies")
         print("Try running manually: pip install -r requirements.txt")
         sys.exit(1)
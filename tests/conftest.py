@@ -0,0 +1,13 @@
+"""
+Shared pytest fixtures for automator tests.
+"""
+
+import pytest
+
+from automator.core.dsl import Target
+
+
+@pytest.fixture(scope="session")
+def empty_target():
+    """Shared empty target for tests that only exercise step/recipe fields."""
+    return Target()
@@ -27,6 +27,14 @@ class TestElementSelector:
         assert selector.control_type == "Button"
         assert selector.name == "Submit"
         assert selector.index == 0  # Default value
+        assert selector.max_depth == 3  # Default value
+    
+    def test_max_depth_validation(self):
+        """Test search depth validation."""
+        assert ElementSelector(name="Submit", max_depth=None).max_depth is None
+        
+        with pytest.raises(ValidationError):
+            ElementSelector(name="Submit", max_depth=0)
     
     def test_element_selector_entropy_score(self):
         """Test entropy scoring for element selectors."""
@@ -50,6 +58,22 @@ class TestElementSelector:
         empty_selector = ElementSelector()
         assert empty_selector.get_selector_entropy_score() == 0
     
+    def test_entropy_score_after_copy(self):
+        """Test entropy score follows fields changed by model_copy."""
+        selector = ElementSelector(automation_id="unique_id", name="Submit")
+        copied = selector.model_copy(update={"automation_id": None})
+        assert copied.get_selector_entropy_score() == 2
+        assert copied.has_selectors()
+        assert not copied.model_copy(update={"name": None}).has_selectors()
+    
+    def test_selector_is_frozen_and_hashable(self):
+        """Test selectors are immutable value objects."""
+        selector = ElementSelector(automation_id="btn_submit")
+        assert hash(selector) == hash(ElementSelector(automation_id="btn_submit"))
+        
+        with pytest.raises(ValidationError):
+            selector.name = "Submit"
+    
     def test_has_selectors(self):
         """Test selector existence check."""
         with_selector = ElementSelector(name="Test")
@@ -72,13 +96,13 @@ class TestWindowSelector:
         assert selector.name == "Calculator"
         assert selector.class_name == "ApplicationFrameWindow"
     
-    def test_window_name_validation(self):
+    @pytest.mark.parametrize("name", ["Valid Window Name", "OK"])
+    def test_window_name_validation(self, name):
         """Test window name validation."""
-        # Valid name
-        valid_selector = WindowSelector(name="Valid Window Name")
-        assert valid_selector.name == "Valid Window Name"
-        
-        # Invalid name (too short)
+        assert WindowSelector(name=name).name == name
+    
+    def test_invalid_window_name(self):
+        """Test too-short window names are rejected."""
         with pytest.raises(ValidationError):
             WindowSelector(name="A")
 
@@ -145,63 +169,31 @@ class TestActionStep:
         assert step.retry_attempts == 3
         assert step.verify_after is True  # Default value
     
-    def test_timeout_validation(self):
+    @pytest.mark.parametrize("timeout", [1, 30, 300])
+    def test_timeout_validation(self, empty_target, timeout):
         """Test timeout validation."""
-        # Valid timeout
-        step = ActionStep(
-            name="Test",
-            action=ActionType.CLICK,
-            target=Target(),
-            timeout=30
-        )
-        assert step.timeout == 30
-        
-        # Invalid timeout (too low)
-        with pytest.raises(ValidationError):
-            ActionStep(
-                name="Test",
-                action=ActionType.CLICK,
-                target=Target(),
-                timeout=0
-            )
-        
-        # Invalid timeout (too high)
+        step = ActionStep(name="Test", action=ActionType.CLICK, target=empty_target, timeout=timeout)
+        assert step.timeout == timeout
+    
+    @pytest.mark.parametrize("timeout", [0, 301])
+    def test_invalid_timeout(self, empty_target, timeout):
+        """Test out-of-range timeouts are rejected."""
         with pytest.raises(ValidationError):
-            ActionStep(
-                name="Test",
-                action=ActionType.CLICK,
-                target=Target(),
-                timeout=500
-            )
+            ActionStep(name="Test", action=ActionType.CLICK, target=empty_target, timeout=timeout)
     
-    def test_retry_attempts_validation(self):
+    @pytest.mark.parametrize("retry_attempts", [1, 5, 10])
+    def test_retry_attempts_validation(self, empty_target, retry_attempts):
         """Test retry attempts validation."""
-        # Valid retry attempts
-        step = ActionStep(
-            name="Test",
-            action=ActionType.CLICK,
-            target=Target(),
-            retry_attempts=5
-        )
-        assert step.retry_attempts == 5
-        
-        # Invalid retry attempts (too low)
-        with pytest.raises(ValidationError):
-            ActionStep(
-                name="Test",
-                action=ActionType.CLICK,
-                target=Target(),
-                retry_attempts=0
-            )
-        
-        # Invalid retry attempts (too high)
+        step = ActionStep(name="Test", action=ActionType.CLICK, target=empty_target,
+                          retry_attempts=retry_attempts)
+        assert step.retry_attempts == retry_attempts
+    
+    @pytest.mark.parametrize("retry_attempts", [0, 11])
+    def test_invalid_retry_attempts(self, empty_target, retry_attempts):
+        """Test out-of-range retry attempts are rejected."""
         with pytest.raises(ValidationError):
-            ActionStep(
-                name="Test",
-                action=ActionType.CLICK,
-                target=Target(),
-                retry_attempts=20
-            )
+            ActionStep(name="Test", action=ActionType.CLICK, target=empty_target,
+                       retry_attempts=retry_attempts)
 
 
 class TestRecipe:
@@ -226,27 +218,25 @@ class TestRecipe:
         assert recipe.version == "1.0"  # Default value
         assert len(recipe.steps) == 1
     
-    def test_recipe_name_validation(self):
+    @pytest.mark.parametrize("name", ["test_recipe", "MyRecipe-123", "recipe1"])
+    def test_recipe_name_validation(self, empty_target, name):
         """Test recipe name validation."""
-        # Valid names
-        valid_names = ["test_recipe", "MyRecipe-123", "recipe1"]
-        for name in valid_names:
-            recipe = Recipe(
+        recipe = Recipe(
+            name=name,
+            description="Test",
+            steps=[ActionStep(name="Test", action=ActionType.CLICK, target=empty_target)]
+        )
+        assert recipe.name == name
+    
+    @pytest.mark.parametrize("name", ["123recipe", "recipe with spaces", "recipe@special"])
+    def test_invalid_recipe_name(self, empty_target, name):
+        """Test invalid recipe names are rejected."""
+        with pytest.raises(ValidationError):
+            Recipe(
                 name=name,
                 description="Test",
-                steps=[ActionStep(name="Test", action=ActionType.CLICK, target=Target())]
+                steps=[ActionStep(name="Test", action=ActionType.CLICK, target=empty_target)]
             )
-            assert recipe.name == name
-        
-        # Invalid names
-        invalid_names = ["123recipe", "recipe with spaces", "recipe@special"]
-        for name in invalid_names:
-            with pytest.raises(ValidationError):
-                Recipe(
-                    name=name,
-                    description="Test",
-                    steps=[ActionStep(name="Test", action=ActionType.CLICK, target=Target())]
-                )
     
     def test_steps_validation(self):
         """Test steps validation."""
@@ -308,6 +298,10 @@ class TestRecipe:
         result = recipe.substitute_variables("Hello ${missing}!")
         assert result == "Hello ${missing}!"
         
+        # Test bare dollar signs (should remain unchanged)
+        result = recipe.substitute_variables("Costs $$5 for $name")
+        assert result == "Costs $$5 for $name"
+        
         # Test non-string input
         result = recipe.substitute_variables(123)
         assert result == 123
@@ -381,6 +375,16 @@ class TestRecipeValidator:
         assert second_fallback.class_name == "btn-class"
         assert second_fallback.name == "Submit"
         assert second_fallback.automation_id is None
+    
+    def test_selector_fallbacks_keep_search_options(self):
+        """Test fallbacks keep the primary's index and search depth."""
+        primary_selector = ElementSelector(
+            automation_id="primary_id", control_type="Button", name="Submit", index=1, max_depth=6
+        )
+        
+        for fallback in RecipeValidator.validate_selector_fallbacks(primary_selector):
+            assert fallback.index == 1
+            assert fallback.max_depth == 6
 
 
 class TestRecipeLoading:
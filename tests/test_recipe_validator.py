@@ -0,0 +1,93 @@
+"""
+Unit tests for the standalone recipe validator.
+Tests structure checks and the compiled JSON recipe cache.
+"""
+
+import json
+import os
+
+import pytest
+import yaml
+
+from automator.tools.recipe_validator import (
+    compile_recipe, load_recipe_data, main, recipe_cache_path, validate_recipe_structure
+)
+
+
+VALID_RECIPE = """\
+name: demo
+description: Demo recipe
+steps:
+  - name: Open
+    action: launch
+    target: {}
+"""
+
+
+@pytest.fixture
+def recipe_path(tmp_path):
+    """Write a valid recipe to a temporary file."""
+    path = tmp_path / "demo.yaml"
+    path.write_text(VALID_RECIPE, encoding="utf-8")
+    return str(path)
+
+
+class TestValidateRecipeStructure:
+    """Test validate_recipe_structure reporting."""
+
+    def test_valid_recipe(self, recipe_path, capsys):
+        """Test a well-formed recipe passes."""
+        assert validate_recipe_structure(recipe_path)
+        assert "Step 1: Open (launch)" in capsys.readouterr().out
+
+    def test_missing_fields_reported_together(self, tmp_path, capsys):
+        """Test every missing top-level field is reported at once."""
+        path = tmp_path / "bad.yaml"
+        path.write_text("name: bad\n", encoding="utf-8")
+
+        assert not validate_recipe_structure(str(path))
+        assert "Missing required fields: ['description', 'steps']" in capsys.readouterr().out
+
+    @pytest.mark.parametrize("missing_field", ["name", "action", "target"])
+    def test_step_missing_field_fails(self, tmp_path, capsys, missing_field):
+        """Test a step without a required field fails validation."""
+        step = {"name": "Open", "action": "launch", "target": {}}
+        del step[missing_field]
+        path = tmp_path / "bad.yaml"
+        path.write_text(yaml.safe_dump({"name": "bad", "description": "Bad", "steps": [step]}),
+                        encoding="utf-8")
+
+        assert not validate_recipe_structure(str(path))
+        assert f"Steps missing field '{missing_field}': [1]" in capsys.readouterr().out
+
+    def test_main_exit_codes(self, recipe_path, tmp_path, capsys):
+        """Test the CLI entry point returns an exit code."""
+        assert main([recipe_path]) == 0
+        assert main([str(tmp_path / "missing.yaml")]) == 1
+        assert main([]) == 1
+
+
+class TestRecipeCache:
+    """Test the compiled JSON recipe cache."""
+
+    def test_compiled_copy_used_when_source_matches(self, recipe_path):
+        """Test the compiled copy is loaded while its digest matches the YAML."""
+        cache_path = compile_recipe(recipe_path)
+        assert cache_path == recipe_cache_path(recipe_path)
+
+        with open(cache_path, encoding="utf-8") as f:
+            compiled = json.load(f)
+        compiled["recipe"] = {"name": "from-cache"}
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(compiled, f)
+        assert load_recipe_data(recipe_path) == {"name": "from-cache"}
+
+    def test_stale_compiled_copy_ignored(self, recipe_path):
+        """Test the YAML source wins once edited, even if the copy looks newer."""
+        cache_path = compile_recipe(recipe_path)
+        with open(recipe_path, "w", encoding="utf-8") as f:
+            f.write(VALID_RECIPE.replace("name: demo", "name: edited"))
+        yaml_mtime = os.path.getmtime(recipe_path)
+        os.utime(cache_path, (yaml_mtime + 10, yaml_mtime + 10))
+
+        assert load_recipe_data(recipe_path)["name"] == "edited"
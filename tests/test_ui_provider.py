@@ -0,0 +1,94 @@
+"""
+Unit tests for UIProvider background verification.
+Windows-only modules are replaced with mocks so the bookkeeping runs anywhere.
+"""
+
+import importlib
+import sys
+import time
+import types
+from unittest.mock import MagicMock
+
+import pytest
+
+import automator.providers
+from automator.core.dsl import ElementSelector
+
+
+WINDOWS_MODULES = [
+    "pywinauto", "pywinauto.controls", "pywinauto.controls.uiawrapper",
+    "pywinauto.uia_defines", "pywinauto.uia_element_info", "comtypes", "uiautomation",
+]
+
+
+@pytest.fixture
+def ui(monkeypatch):
+    """Import automator.providers.ui against mocked Windows modules."""
+    for name in WINDOWS_MODULES:
+        monkeypatch.setitem(sys.modules, name, MagicMock(name=name))
+    findwindows = types.ModuleType("pywinauto.findwindows")
+    findwindows.ElementNotFoundError = type("ElementNotFoundError", (Exception,), {})
+    monkeypatch.setitem(sys.modules, "pywinauto.findwindows", findwindows)
+    logger = types.ModuleType("automator.core.logger")
+    logger.automator_logger = MagicMock(name="automator_logger")
+    monkeypatch.setitem(sys.modules, "automator.core.logger", logger)
+    monkeypatch.delitem(sys.modules, "automator.providers.ui", raising=False)
+
+    module = importlib.import_module("automator.providers.ui")
+    # Drop the mocked import again once the test is done
+    monkeypatch.setitem(sys.modules, "automator.providers.ui", module)
+    monkeypatch.setattr(automator.providers, "ui", module, raising=False)
+    return module
+
+
+@pytest.fixture
+def provider(ui, monkeypatch):
+    """UIProvider whose element lookups always find one ready element."""
+    provider = ui.UIProvider()
+    provider.element = MagicMock(name="element")
+    monkeypatch.setattr(provider, "_find_element", lambda *args, **kwargs: provider.element)
+    monkeypatch.setattr(provider, "_read_states", lambda element, states: dict.fromkeys(states, True))
+    yield provider
+    provider.cleanup()
+
+
+class TestBackgroundVerification:
+    """Test deferred click/type verification bookkeeping."""
+
+    def test_failed_verification_is_sticky(self, provider, monkeypatch):
+        """Test a failed check is still reported after later steps succeed."""
+        def fail(*args):
+            raise RuntimeError("Click verification failed")
+        monkeypatch.setattr(provider, "_verify_click_success", fail)
+        selector = ElementSelector(automation_id="submit")
+
+        assert provider.click_element(selector)
+        assert provider.wait_for_element(selector, timeout=1)
+        assert "Click verification failed" in provider.failed_verification
+
+        # A retried or later step cannot clear the failure
+        assert provider.wait_for_element(selector, timeout=1)
+        assert provider.failed_verification is not None
+        assert not provider.finish_verifications()
+
+    def test_input_waits_for_pending_verification(self, provider, monkeypatch):
+        """Test the next input step runs only after the pending check finished."""
+        events = []
+        def verify(*args):
+            time.sleep(0.05)
+            events.append("verify")
+        monkeypatch.setattr(provider, "_verify_click_success", verify)
+        provider.element.click_input.side_effect = lambda: events.append("click")
+        selector = ElementSelector(automation_id="submit")
+
+        assert provider.click_element(selector)
+        assert provider.click_element(selector, verify=False)
+        assert events == ["click", "verify", "click"]
+
+    def test_successful_verifications(self, provider, monkeypatch):
+        """Test passing checks leave the run successful."""
+        monkeypatch.setattr(provider, "_verify_click_success", lambda *args: None)
+
+        assert provider.click_element(ElementSelector(automation_id="submit"))
+        assert provider.finish_verifications()
+        assert provider.failed_verification is None